@@ -28,7 +28,6 @@
 # +
 import numpy as np
 import dolfinx as dolx
-import matplotlib.pyplot as plt
 import os
 import ufl
 import mgis.behaviour as mgis_bv
@@ -75,9 +74,12 @@ def right(x):
     return np.isclose(x[0], length)
 
 
-left_dofs = fem.locate_dofs_geometrical(V, left)
+fdim = gdim - 1
+left_facets = mesh.locate_entities_boundary(domain, fdim, left)
+right_facets = mesh.locate_entities_boundary(domain, fdim, right)
+left_dofs = fem.locate_dofs_topological(V, fdim, left_facets)
 V_x, _ = V.sub(0).collapse()
-right_dofs = fem.locate_dofs_geometrical((V.sub(0), V_x), right)
+right_dofs = fem.locate_dofs_topological((V.sub(0), V_x), fdim, right_facets)
 
 uD = fem.Function(V_x)
 bcs = [
@@ -122,13 +124,17 @@ def F(u):
 def dF(u):
     return nonsymmetric_tensor_to_vector(ufl.grad(u))
 
+# The variation of the Green-Lagrange strain is written with the finite-strain
+# strain-displacement operator $\delta\boldsymbol{E} = \operatorname{sym}(\boldsymbol{F}^\text{T}\nabla\boldsymbol{v})$
+# which requires a single tensor contraction per quadrature point.
 def dEgl(u,v):
-    grad_v = ufl.grad(v)
-    grad_u = ufl.grad(u)
-    return symmetric_tensor_to_vector((1/2)*(grad_v+grad_v.T+ufl.dot(grad_u.T,grad_v)+ufl.dot(grad_v.T,grad_u)))
+    DG = ufl.Identity(gdim) + ufl.grad(u)
+    return symmetric_tensor_to_vector(ufl.sym(ufl.dot(DG.T, ufl.grad(v))))
 
 
-quadrature_degree = 2
+# A full $3\times 3$ Gauss rule is used on the $Q_2$ quadrilaterals to avoid
+# spurious zero-energy modes of the reduced $2\times 2$ rule.
+quadrature_degree = 4
 qmap = QuadratureMap(domain, quadrature_degree, material)
 qmap.register_gradient("DeformationGradient", F(u))
 # -
@@ -151,8 +157,11 @@ Jac = qmap.derivative(Res, u, du)
 
 # Finally, we setup the nonlinear problem, the corresponding Newton solver and solve the load-stepping problem.
 
+# The residual and tangent kernels are compute-bound at the quadrature points, we therefore let the C compiler optimize and vectorize the generated code for the host architecture.
+
 # + tags=["hide-output"]
-problem = NonlinearMaterialProblem(qmap, Res, Jac, u, bcs)
+jit_options = {"cffi_extra_compile_args": ["-O3", "-march=native"]}
+problem = NonlinearMaterialProblem(qmap, Res, Jac, u, bcs, jit_options=jit_options)
 
 newton = NewtonSolver(comm)
 newton.rtol = 1e-4
@@ -164,21 +173,44 @@ newton.report = True
 ksp = newton.krylov_solver
 opts = PETSc.Options()
 option_prefix = ksp.getOptionsPrefix()
-#opts[f"{option_prefix}ksp_type"] = "bcgs"
-#opts[f"{option_prefix}pc_type"] = "mg"
-#opts[f"{option_prefix}ksp_atol"] = "1e-16"
-#opts[f"{option_prefix}ksp_rtol"] = "1e-16"
 #opts[f"{option_prefix}ksp_monitor"] = ""
-opts[f"{option_prefix}ksp_type"] = "preonly"
-opts[f"{option_prefix}pc_type"] = "lu"
-opts[f"{option_prefix}pc_factor_mat_solver_type"] = "mumps"
+direct_solver = False
+if direct_solver:
+    # The SVK tangent operator is symmetric, a symmetric (LDL^T) factorization is
+    # therefore used with MUMPS, which halves the factorization cost and storage.
+    opts[f"{option_prefix}ksp_type"] = "preonly"
+    opts[f"{option_prefix}pc_type"] = "cholesky"
+    opts[f"{option_prefix}pc_factor_mat_solver_type"] = "mumps"
+else:
+    # For larger meshes, the tangent operator, which remains positive-definite
+    # for this loading, is solved with a conjugate gradient preconditioned by
+    # smoothed aggregation AMG built upon the rigid body modes.
+    rigid_modes = [fem.Function(V) for _ in range(3)]
+    rigid_modes[0].interpolate(lambda x: np.vstack((np.ones_like(x[0]), np.zeros_like(x[0]))))
+    rigid_modes[1].interpolate(lambda x: np.vstack((np.zeros_like(x[0]), np.ones_like(x[0]))))
+    rigid_modes[2].interpolate(lambda x: np.vstack((-x[1], x[0])))
+    basis = [mode.x.petsc_vec for mode in rigid_modes]
+    for i, b in enumerate(basis):  # Gram-Schmidt orthonormalization
+        for b_prev in basis[:i]:
+            b.axpy(-b.dot(b_prev), b_prev)
+        b.normalize()
+    problem.matrix().setNearNullSpace(PETSc.NullSpace().create(vectors=basis, comm=comm))
+
+    opts[f"{option_prefix}ksp_type"] = "cg"
+    opts[f"{option_prefix}ksp_rtol"] = 1e-8
+    opts[f"{option_prefix}pc_type"] = "gamg"
+    opts[f"{option_prefix}mg_levels_ksp_type"] = "chebyshev"
+    opts[f"{option_prefix}mg_levels_pc_type"] = "jacobi"
 ksp.setFromOptions()
 
 Nincr = 30
 load_steps = np.linspace(0.0, 1.0, Nincr + 1)
 
-vtk = io.VTKFile(domain.comm, f"results/{material.name}.pvd", "w")
+vtx = io.VTXWriter(domain.comm, f"results/{material.name}.bp", [u], engine="BP4")
 results = np.zeros((Nincr + 1, 2))
+local_max = np.zeros(1)
+global_max = np.zeros(1)
+_, uy_dofs = V.sub(1).collapse()
 for i, t in enumerate(load_steps[1:]):
     selfweight.value[-1] = -50e3 * t
 
@@ -189,27 +221,27 @@ for i, t in enumerate(load_steps[1:]):
 
     #p0 = qmap.project_on("GreenL", ("DG", 0))
 
-    vtk.write_function(u, t)
-    #vtk.write_function(p0, t)
+    vtx.write(t)
 
-    w = u.sub(1)
-    local_max = max(np.abs(w.vector.array))
+    local_max[0] = np.abs(u.x.array[uy_dofs]).max()
     # Perform the reduction to get the global maximum on rank 0
-    global_max = MPI.COMM_WORLD.reduce(local_max, op=MPI.MAX, root=0)
-    results[i + 1, 0] = global_max
+    comm.Reduce([local_max, MPI.DOUBLE], [global_max, MPI.DOUBLE], op=MPI.MAX, root=0)
+    results[i + 1, 0] = global_max[0]
     results[i + 1, 1] = t
-vtk.close()
+vtx.close()
 # -
 
 # During the load incrementation, we monitor the evolution of the maximum vertical downwards displacement.
 # The load-displacement curve exhibits a classical elastoplastic behavior rapidly followed by a stiffening behavior due to membrane catenary effects.
 
 if rank==0:
+    import matplotlib.pyplot as plt
+
     plt.figure()
     plt.plot(results[:, 0], results[:, 1], "-oC3")
     plt.xlabel("Displacement")
     plt.ylabel("Load")
-    plt.savefig('./displacement_PK2_10x_4y.pdf',bbox_inches='tight', format = 'pdf', dpi =  600)
+    plt.savefig('./displacement_PK2_10x_4y.pdf', bbox_inches='tight', format='pdf')
     plt.show()
 
 # ## References
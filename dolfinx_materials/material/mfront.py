@@ -98,6 +98,9 @@ class MFrontMaterial:
     def set_data_manager(self, ngauss):
         # Setting the material data manager
         self.data_manager = mgis_bv.MaterialDataManager(self.behaviour, ngauss)
+        # tangent operator blocks are allocated once for all quadrature points
+        # and reused by each batched integration call
+        self.data_manager.allocateArrayOfTangentOperatorBlocks()
         self.initialize_external_state_variable("Temperature", 293.15)
         self.update_external_state_variable("Temperature", 293.15)
 
@@ -250,7 +253,6 @@ class MFrontMaterial:
         self.data_manager.s1.gradients[:, :] = eps
         # TODO Clarify settings of K, if at all necessary, depending on the
         # PK1/PK2 etc.
-        self.data_manager.allocateArrayOfTangentOperatorBlocks()
         K = self.data_manager.K
         K[:, 0, 0] = 4  # Consistent tangent operator
         K[:, 0, 1] = 1  # 0 - Cauchy, 1 - PK2, 2 - PK1
@@ -21,6 +21,17 @@ def create_quadrature_function(name, shape, mesh, quadrature_degree):
     return fem.Function(function_space, name=name)
 
 
+def variation(ufl_expression, u, v):
+    """Computes the variation of a UFL expression with respect to u in direction v."""
+    deriv = sum(
+        [
+            ufl.derivative(ufl_expression, var, v_)
+            for (var, v_) in zip(ufl.split(u), ufl.split(v))
+        ]
+    )
+    return ufl.algorithms.expand_derivatives(deriv)
+
+
 class QuadratureExpression:
     def __init__(self, name, expression, mesh, quadrature_degree):
         self.ufl_shape = expression.ufl_expression.ufl_shape
@@ -32,6 +43,10 @@ class QuadratureExpression:
         map_c = mesh.topology.index_map(mesh.topology.dim)
         num_cells = map_c.size_local + map_c.num_ghosts
         self._mesh_cells = np.arange(0, num_cells, dtype=np.int32)
+        # evaluation buffers are cached for the last set of cells
+        self._cells = None
+        self._dofs = None
+        self._values = None
         self.eval(None)
 
     def initialize_function(self, mesh, quadrature_degree):
@@ -45,20 +60,17 @@ class QuadratureExpression:
     def eval(self, cells):
         if cells is None:
             cells = self._mesh_cells
+        if cells is not self._cells:
+            with Timer("dx_mat:Prepare dofs"):
+                self._dofs = cell_to_dofs(cells, self._function_space)
+            self._values = None
+            self._cells = cells
         with Timer("dx_mat:Function eval"):
-            expr_eval = self.expression.eval(self.mesh, cells)
-        with Timer("dx_mat:Prepare dofs"):
-            dofs = cell_to_dofs(cells, self._function_space)
-        self.function.x.array[dofs] = expr_eval.flatten()[:]
+            self._values = self.expression.eval(self.mesh, cells, self._values)
+        self.function.x.array[self._dofs] = self._values.ravel()
 
     def variation(self, u, v):
-        deriv = sum(
-            [
-                ufl.derivative(self.expression.ufl_expression, var, v_)
-                for (var, v_) in zip(ufl.split(u), ufl.split(v))
-            ]
-        )
-        return ufl.algorithms.expand_derivatives(deriv)
+        return variation(self.expression.ufl_expression, u, v)
 
     def set_values(self, x):
         self.function.x.array[:] = x
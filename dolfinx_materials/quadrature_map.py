@@ -7,11 +7,14 @@ from .utils import (
     create_quadrature_functionspace,
     to_mat,
     get_vals,
-    update_vals,
     symmetric_tensor_to_vector
 )
 from dolfinx.common import Timer
-from .quadrature_function import create_quadrature_function, QuadratureExpression
+from .quadrature_function import (
+    create_quadrature_function,
+    QuadratureExpression,
+    variation,
+)
 from mpi4py import MPI
 
 
@@ -144,13 +147,9 @@ class QuadratureMap:
             if dx == 'GreenLagrangeStrain':
                 DG = ufl.Identity(len(u)) + ufl.grad(u)
                 Egl = symmetric_tensor_to_vector((1/2)*(ufl.dot(DG.T,DG)-ufl.Identity(len(u))))
-                Egl_fem_expression = fem.Expression(Egl, self.quadrature_points)
-                Egl_quadrature_expression = QuadratureExpression("Egl",
-                                                                 Egl_fem_expression,
-                                                                 self.mesh,
-                                                                 self.degree
-                                                                 )
-                delta_dx = Egl_quadrature_expression.variation(u,du)
+                # only the symbolic variation is needed, no need to compile and
+                # evaluate Egl at quadrature points
+                delta_dx = variation(Egl, u, du)
             else:
                 if dx in self.gradients:
                     delta_dx = self.gradients[dx].variation(u, du)
@@ -266,6 +265,11 @@ class QuadratureMap:
             + np.repeat(np.arange(num_qp)[np.newaxis, :], len(cells), axis=0)
         ).ravel()
 
+    def _update_vals(self, field, values):
+        """Writes values at the material quadrature points of field, reusing the
+        precomputed quadrature point indices."""
+        get_vals(field)[self.dofs] = np.reshape(values, (len(self.dofs), -1))
+
     def update_initial_state(self, field_name, value=None):
         """Update a material field with corresponding dolfinx object."""
         if field_name in self.fluxes:
@@ -278,7 +282,7 @@ class QuadratureMap:
         values = get_vals(field)[self.dofs]
         if isinstance(value, (int, float, np.ndarray)):
             values = np.full_like(values, value)
-            update_vals(field, values, self.cells)
+            self._update_vals(field, values)
         elif value is not None:
             self.eval_quadrature(value, field)
             values = get_vals(field)[self.dofs]
@@ -302,7 +306,6 @@ class QuadratureMap:
 
     def update(self):
         """Perform constitutive update call."""
-        num_QP = len(self.quadrature_points) * self.num_cells
         if not self._initialized:
             self.initialize_state()
 
@@ -324,11 +327,7 @@ class QuadratureMap:
                 grad_vals.ravel(), self.rotation_func.x.array
             )
 
-        flux_size = sum(list(self.material.fluxes.values()))
-        flux_vals = np.zeros((num_QP, flux_size))
-        Ct_vals = np.zeros_like(get_vals(self.jacobian_flatten)[self.dofs])
-
-        # material integration
+        # material integration over all quadrature points at once
         flux_vals, isv_vals, Ct_vals = self.material.integrate(grad_vals)
         assert not (np.any(np.isnan(flux_vals)))
         assert not (np.any(np.isnan(isv_vals)))
@@ -342,20 +341,20 @@ class QuadratureMap:
 
         self.update_fluxes(flux_vals)
         self.update_internal_state_variables(isv_vals)
-        update_vals(self.jacobian_flatten, Ct_vals, self.cells)
+        self._update_vals(self.jacobian_flatten, Ct_vals)
 
     def update_fluxes(self, flux_vals):
         buff = 0
         for name, dim in self.material.fluxes.items():
             flux = self.fluxes[name]
-            update_vals(flux, flux_vals[:, buff : buff + dim], self.cells)
+            self._update_vals(flux, flux_vals[:, buff : buff + dim])
             buff += dim
 
     def update_internal_state_variables(self, isv_vals):
         buff = 0
         for name, dim in self.material.internal_state_variables.items():
             isv = self.internal_state_variables[name]
-            update_vals(isv, isv_vals[:, buff : buff + dim], self.cells)
+            self._update_vals(isv, isv_vals[:, buff : buff + dim])
             buff += dim
 
     def advance(self):
@@ -367,7 +366,7 @@ class QuadratureMap:
         final_state = self.material.get_final_state_dict()
         for key in self.variables.keys():
             if key not in self.gradients:  # update flux and isv but not gradients
-                update_vals(self.variables[key], final_state[key], self.cells)
+                self._update_vals(self.variables[key], final_state[key])
 
     def project_on(self, name, interp):
         """
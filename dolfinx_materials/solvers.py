@@ -23,7 +23,19 @@ class CustomNewtonProblem:
     Custom implementation of the Newton method for `QuadratureMap` objects.
     """
 
-    def __init__(self, quadrature_map, F, J, u, bcs, max_it=50, rtol=1e-8, atol=1e-8):
+    def __init__(
+        self,
+        quadrature_map,
+        F,
+        J,
+        u,
+        bcs,
+        max_it=50,
+        rtol=1e-8,
+        atol=1e-8,
+        form_compiler_options=None,
+        jit_options=None,
+    ):
         """
         Parameters
         ----------
@@ -43,16 +55,24 @@ class CustomNewtonProblem:
             Relative tolerance, by default 1e-8
         atol : float, optional
             Absolute tolerance, by default 1e-8
+        form_compiler_options : dict, optional
+            FFCx options used when compiling the residual and Jacobian forms
+        jit_options : dict, optional
+            JIT options (e.g. C compiler flags) used when compiling the forms
         """
         self.quadrature_map = quadrature_map
+        compile_options = {
+            "form_compiler_options": form_compiler_options,
+            "jit_options": jit_options,
+        }
         if isinstance(F, list):
-            self.L = [form(f) for f in F]
+            self.L = [form(f, **compile_options) for f in F]
         else:
-            self.L = form(F)
+            self.L = form(F, **compile_options)
         if isinstance(J, list):
-            self.a = [form(j) for j in J]
+            self.a = [form(j, **compile_options) for j in J]
         else:
-            self.a = form(J)
+            self.a = form(J, **compile_options)
         self.bcs = bcs
         self._F, self._J = None, None
         self.u = u
@@ -179,7 +199,7 @@ class NonlinearMaterialProblem(NonlinearProblem):
     This class handles the definition of a nonlinear problem containing an abstract `QuadratureMap` object compatible with a dolfinx NewtonSolver.
     """
 
-    def __init__(self, qmap, F, J, u, bcs):
+    def __init__(self, qmap, F, J, u, bcs, form_compiler_options=None, jit_options=None):
         """
         Parameters
         ----------
@@ -193,10 +213,23 @@ class NonlinearMaterialProblem(NonlinearProblem):
             Unknown function representing the solution
         bcs : list
             list of fem.dirichletbc
+        form_compiler_options : dict, optional
+            FFCx options used when compiling the residual and Jacobian forms
+        jit_options : dict, optional
+            JIT options (e.g. C compiler flags) used when compiling the forms
         """
-        super().__init__(F, u, J=J, bcs=bcs)
+        super().__init__(
+            F,
+            u,
+            J=J,
+            bcs=bcs,
+            form_compiler_options=form_compiler_options,
+            jit_options=jit_options,
+        )
         self._F = None
         self._J = None
+        self._A = None
+        self._b = None
         self.u = u
         if not isinstance(qmap, list):
             self.quadrature_maps = [qmap]
@@ -213,14 +246,26 @@ class NonlinearMaterialProblem(NonlinearProblem):
             qmap.advance()
 
     def form(self, x):
+        """Performs the constitutive update once per Newton iteration.
+
+        Fluxes and tangent operators are stored in quadrature functions which are
+        then shared by the residual and Jacobian assemblies."""
         x.ghostUpdate(addv=PETSc.InsertMode.INSERT, mode=PETSc.ScatterMode.FORWARD)
         self._constitutive_update()
 
     def matrix(self):
-        return create_matrix(self.a)
+        # the Jacobian matrix is allocated once and reused across solves so that
+        # its sparsity pattern, hence the symbolic factorization, is kept.
+        # It is zeroed before each assembly by the Newton solver.
+        if self._A is None:
+            self._A = create_matrix(self.a)
+            self._A.setOption(PETSc.Mat.Option.NEW_NONZERO_LOCATION_ERR, True)
+        return self._A
 
     def vector(self):
-        return create_vector(self.L)
+        if self._b is None:
+            self._b = create_vector(self.L)
+        return self._b
 
     def solve(self, solver, print_solution=True):
         """Solve the problem
@@ -306,7 +351,7 @@ class SNESNonlinearMaterialProblem(NonlinearMaterialProblem):
         it: int
             Number of iterations to convergence
         """
-        solver.setFunction(self.F, self.x.petsc_vec())
+        solver.setFunction(self.F, self.vector())
         solver.setJacobian(self.J, self.matrix())
 
         solver.solve(None, self.u.x.petsc_vec)